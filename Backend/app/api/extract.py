@@ -1,18 +1,61 @@
+import tempfile
+
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from app.services.ocr_tesseract import ocr_with_conf
 from app.services.receipt_parser import parse_receipt_fields
 
 router = APIRouter()
 
+MAX_UPLOAD_BYTES = 20 * 1024 * 1024  # reject oversized uploads early
+SPOOL_MAX_BYTES = 2 * 1024 * 1024    # typical receipts stay in RAM
+CHUNK_SIZE = 64 * 1024
+
+_JPEG_MAGIC = b"\xff\xd8\xff"
+_PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+
+
+def _looks_like_image(head: bytes) -> bool:
+    return head.startswith(_JPEG_MAGIC) or head.startswith(_PNG_MAGIC)
+
+
 @router.post("/extract")
 async def extract(receipt: UploadFile = File(...)):
     if receipt.content_type not in {"image/png", "image/jpeg", "image/jpg"}:
         raise HTTPException(status_code=400, detail="Upload a PNG/JPEG image.")
 
-    image_bytes = await receipt.read()
-    ocr = ocr_with_conf(image_bytes)  # {text, words:[{text, conf}]}
+    if receipt.size and receipt.size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Image too large (max 20 MB).")
+
+    # Stream the upload instead of buffering it whole: small files stay
+    # in memory, big phone photos spill to disk, and the size cap is
+    # enforced while receiving rather than after.
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    try:
+        received = 0
+        while chunk := await receipt.read(CHUNK_SIZE):
+            received += len(chunk)
+            if received > MAX_UPLOAD_BYTES:
+                raise HTTPException(status_code=413, detail="Image too large (max 20 MB).")
+            spooled.write(chunk)
+
+        if received == 0:
+            raise HTTPException(status_code=400, detail="Empty upload.")
+
+        # content_type above is client-supplied; verify the actual bytes
+        # before handing anything to PIL.
+        spooled.seek(0)
+        if not _looks_like_image(spooled.read(8)):
+            raise HTTPException(status_code=400, detail="Upload a PNG/JPEG image.")
+        spooled.seek(0)
+
+        # OCR takes seconds of CPU; run it (and the parse) in the threadpool
+        # so the event loop keeps serving other requests meanwhile.
+        ocr = await run_in_threadpool(ocr_with_conf, spooled)  # {text, words:[{text, conf}]}
+    finally:
+        spooled.close()
 
-    parsed = parse_receipt_fields(ocr["text"], ocr["words"])
+    parsed = await run_in_threadpool(parse_receipt_fields, ocr["text"], ocr["words"])
 
     # Print to terminal (debug transparency)
     print("\n========== OCR TEXT (first 1200 chars) ==========")
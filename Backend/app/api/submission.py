@@ -1,9 +1,11 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import List, Dict, Any
 
-from app.db.database import get_session
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db
 from app.db.models import SubmissionRecord, AuditEvent
 
 router = APIRouter()
@@ -21,37 +23,35 @@ class SubmissionRequest(BaseModel):
 
 
 @router.post("/submission/create")
-def create_submission(req: SubmissionRequest):
+def create_submission(req: SubmissionRequest, session: Session = Depends(get_db)):
     if not req.user_confirmed:
         return {"status": "BLOCKED", "reason": "User confirmation required."}
 
-    session = get_session()
-    try:
-        submission = SubmissionRecord(
-            receipt_id=req.receipt_id,
-            review_state=req.review_state,
-            final_fields=req.final_fields,
-            policy_rule_ids=req.policy_rule_ids,
-            created_at=datetime.utcnow().isoformat(),
-        )
-        session.add(submission)
-        session.flush()
-
-        audit = AuditEvent(
-            submission_id=submission.id,
-            event_type="SUBMITTED",
-            payload={
-                "issues": req.issues,
-                "edits": req.edits,
-                "justifications": req.justifications,
-                "policy_rule_ids": req.policy_rule_ids,
-                "review_state": req.review_state,
-            },
-            created_at=datetime.utcnow().isoformat(),
-        )
-        session.add(audit)
-
-        session.commit()
-        return {"status": "SUBMITTED", "submission_id": submission.id}
-    finally:
-        session.close()
+    # One timestamp for both rows: cheaper, and the audit event can never
+    # disagree with its submission about when the submit happened.
+    created_at = datetime.utcnow().isoformat()
+
+    submission = SubmissionRecord(
+        receipt_id=req.receipt_id,
+        review_state=req.review_state,
+        final_fields=req.final_fields,
+        policy_rule_ids=req.policy_rule_ids,
+        created_at=created_at,
+    )
+    audit = AuditEvent(
+        submission=submission,
+        event_type="SUBMITTED",
+        payload={
+            "issues": req.issues,
+            "edits": req.edits,
+            "justifications": req.justifications,
+            "policy_rule_ids": req.policy_rule_ids,
+            "review_state": req.review_state,
+        },
+        created_at=created_at,
+    )
+
+    with session.begin():
+        session.add_all([submission, audit])
+
+    return {"status": "SUBMITTED", "submission_id": submission.id}
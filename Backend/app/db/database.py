@@ -3,8 +3,22 @@ from sqlalchemy.orm import sessionmaker
 
 DATABASE_URL = "sqlite:///./expense_ai.db"
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=20,
+    max_overflow=10,
+    pool_pre_ping=True,
+)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 def get_session():
     return SessionLocal()
+
+def get_db():
+    """FastAPI dependency: yields a pooled session and always closes it."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,6 +1,10 @@
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import Integer, String, Text
-import json
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy import ForeignKey, Integer, String, Text
+import orjson
+
+def _dumps(obj) -> str:
+    # orjson serializes to bytes; decode once so the TEXT columns stay unchanged.
+    return orjson.dumps(obj).decode()
 
 class Base(DeclarativeBase):
     pass
@@ -17,20 +21,24 @@ class SubmissionRecord(Base):
     def __init__(self, receipt_id, review_state, final_fields, policy_rule_ids, created_at):
         self.receipt_id = receipt_id
         self.review_state = review_state
-        self.final_fields_json = json.dumps(final_fields)
-        self.policy_rule_ids_json = json.dumps(policy_rule_ids)
+        self.final_fields_json = _dumps(final_fields)
+        self.policy_rule_ids_json = _dumps(policy_rule_ids)
         self.created_at = created_at
 
 class AuditEvent(Base):
     __tablename__ = "audit_events"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    submission_id: Mapped[int] = mapped_column(Integer, index=True)
+    submission_id: Mapped[int] = mapped_column(ForeignKey("submissions.id"), index=True)
     event_type: Mapped[str] = mapped_column(String)
     payload_json: Mapped[str] = mapped_column(Text)
     created_at: Mapped[str] = mapped_column(String)
 
-    def __init__(self, submission_id, event_type, payload, created_at):
-        self.submission_id = submission_id
+    # Lets the unit of work order the two inserts and fill submission_id
+    # without an explicit flush in the route.
+    submission: Mapped["SubmissionRecord"] = relationship(SubmissionRecord)
+
+    def __init__(self, submission, event_type, payload, created_at):
+        self.submission = submission
         self.event_type = event_type
-        self.payload_json = json.dumps(payload)
+        self.payload_json = _dumps(payload)
         self.created_at = created_at
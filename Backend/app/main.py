@@ -1,11 +1,16 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from app.api.extract import router as extract_router
 from app.api.policy import router as policy_router
 from app.api.submission import router as submission_router
 from app.api.explain import router as explain_router
 
-app = FastAPI(title="AI-Assisted Expense Submission (HITL)")
+app = FastAPI(
+    title="AI-Assisted Expense Submission (HITL)",
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,6 +19,10 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+
+# Policy/explain responses repeat the same keys and rule text many times,
+# so they compress very well; tiny payloads are left alone.
+app.add_middleware(GZipMiddleware, minimum_size=512)
 @app.get("/")
 def root():
     return {"status": "ok", "message": "Backend running. Visit /docs for API."}
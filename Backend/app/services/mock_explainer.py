@@ -1,5 +1,21 @@
 from typing import Dict, Any, List
 
+# Clarification question per rule_id ({field} is filled in per issue).
+# A dict lookup replaces the long if/elif chain that compared rid against
+# every known rule for every issue.
+_CLARIFICATIONS = {
+    "POL-REQ-001": "Please provide the missing value for **{field}**.",
+    "POL-REQ-002": "Please attach a receipt image to proceed.",
+    "POL-CONF-100": "Can you confirm or correct the extracted **{field}** value?",
+    "POL-PARSE-101": "Please enter the total amount manually (could not be parsed reliably).",
+    "POL-LIM-010": "Was this a business meal? If yes, add business purpose and attendees (if applicable).",
+    "POL-LIM-020": "Can you provide justification for exceeding the daily limit, or split into multiple lines if allowed?",
+    "POL-DATE-030": "Is the receipt date correct? If yes, provide justification for late/out-of-range submission.",
+    "POL-JUST-040": "Please add a short business purpose (e.g., client meeting, travel, workshop).",
+    "POL-CAT-050": "Does the selected category match the merchant? If not, choose the correct category.",
+    "POL-DUP-060": "Have you already submitted this receipt? If not, confirm it’s a new expense.",
+}
+
 def _dedupe(xs: List[str]) -> List[str]:
     out = []
     seen = set()
@@ -50,36 +66,22 @@ def mock_explain_with_policy(fields: Dict[str, Any],
             bullets.append(f"- **{sev}** `{rid}` ({field}): {msg or 'Policy check triggered.'}")
 
         # Generate clarification questions based on common rules
-        if rid == "POL-REQ-001":
-            clarifications.append(f"Please provide the missing value for **{field}**.")
-        elif rid == "POL-REQ-002":
-            clarifications.append("Please attach a receipt image to proceed.")
-        elif rid == "POL-CONF-100":
-            clarifications.append(f"Can you confirm or correct the extracted **{field}** value?")
-        elif rid == "POL-PARSE-101":
-            clarifications.append("Please enter the total amount manually (could not be parsed reliably).")
-        elif rid == "POL-LIM-010":
-            clarifications.append("Was this a business meal? If yes, add business purpose and attendees (if applicable).")
-        elif rid == "POL-LIM-020":
-            clarifications.append("Can you provide justification for exceeding the daily limit, or split into multiple lines if allowed?")
-        elif rid == "POL-DATE-030":
-            clarifications.append("Is the receipt date correct? If yes, provide justification for late/out-of-range submission.")
-        elif rid == "POL-JUST-040":
-            clarifications.append("Please add a short business purpose (e.g., client meeting, travel, workshop).")
-        elif rid == "POL-CAT-050":
-            clarifications.append("Does the selected category match the merchant? If not, choose the correct category.")
-        elif rid == "POL-DUP-060":
-            clarifications.append("Have you already submitted this receipt? If not, confirm it’s a new expense.")
+        template = _CLARIFICATIONS.get(rid)
+        if template:
+            clarifications.append(template.format(field=field))
 
     clarifications = _dedupe(clarifications)
 
-    # Compose final explanation
-    explanation = (
-        f"Based on the current extracted fields and deterministic policy checks, the system flagged the expense due to "
-        f"the following rule(s):\n\n" + "\n".join(bullets) +
-        "\n\nTo proceed, please address the requested fields or provide the required justification. "
-        "After edits, re-run the policy validation to confirm compliance."
-    )
+    # Compose final explanation (single join, no repeated concatenation)
+    explanation = "\n".join([
+        "Based on the current extracted fields and deterministic policy checks, the system flagged the expense due to "
+        "the following rule(s):",
+        "",
+        *bullets,
+        "",
+        "To proceed, please address the requested fields or provide the required justification. "
+        "After edits, re-run the policy validation to confirm compliance.",
+    ])
 
     return {
         "explanation": explanation,
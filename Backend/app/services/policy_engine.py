@@ -4,11 +4,30 @@ from app.services.rule_summaries import RULE_SUMMARIES
 
 CONF_THRESHOLD = 0.75
 
+REQUIRED_FIELDS = ("merchant", "date", "total", "currency", "category")
+
 
 def issue(field: str, severity: str, rule_id: str, message: str) -> Dict[str, Any]:
     return {"field": field, "severity": severity, "rule_id": rule_id, "message": message}
 
 
+def _confidence(v: Any) -> float:
+    # The schema allows arbitrary field values, so a non-dict entry gets
+    # confidence 0.0 (and with it the POL-CONF-100 WARN) instead of an
+    # AttributeError bubbling up as a 500.
+    if not isinstance(v, dict):
+        return 0.0
+    c = v.get("confidence", 0)
+    # isinstance keeps the happy path free of exception-frame setup;
+    # the try/except only runs for odd inputs like numeric strings.
+    if isinstance(c, (int, float)):
+        return float(c)
+    try:
+        return float(c)
+    except Exception:
+        return 0.0
+
+
 def attach_rule_summaries(issues: List[Dict[str, Any]]) -> List[Dict[str, str]]:
     """
     Return unique rule summaries for triggered rule IDs (policy evidence).
@@ -32,18 +51,28 @@ def attach_rule_summaries(issues: List[Dict[str, Any]]) -> List[Dict[str, str]]:
 def validate_policy(receipt_id: str, fields: Dict[str, Any], user_context: Dict[str, Any]) -> Dict[str, Any]:
     issues: List[Dict[str, Any]] = []
 
-    # 1) Required fields
-    for f in ["merchant", "date", "total", "currency", "category"]:
-        if not fields.get(f, {}).get("value"):
+    # 1+2) Required fields and confidence review (seamful automation
+    # control signal) in a single walk per field.
+    for f in REQUIRED_FIELDS:
+        v = fields.get(f)
+        if v is None:
             issues.append(issue(f, "FAIL", "POL-REQ-001", f"{f} is required."))
+            continue
+        if not isinstance(v, dict):
+            # Same guard as _confidence: a malformed entry counts as a
+            # missing value rather than crashing the walk.
+            v = {}
+        if not v.get("value"):
+            issues.append(issue(f, "FAIL", "POL-REQ-001", f"{f} is required."))
+        conf = _confidence(v)
+        if conf < CONF_THRESHOLD:
+            issues.append(issue(f, "WARN", "POL-CONF-100", f"{f} confidence below threshold ({conf:.2f})."))
 
-    # 2) Confidence-based review (seamful automation control signal)
+    # Extra (non-required) fields still get the confidence check
     for f, v in fields.items():
-        try:
-            conf = float(v.get("confidence", 0))
-        except Exception:
-            conf = 0.0
-
+        if f in REQUIRED_FIELDS:
+            continue
+        conf = _confidence(v)
         if conf < CONF_THRESHOLD:
             issues.append(issue(f, "WARN", "POL-CONF-100", f"{f} confidence below threshold ({conf:.2f})."))
 
@@ -76,12 +105,15 @@ def validate_policy(receipt_id: str, fields: Dict[str, Any], user_context: Dict[
         except Exception:
             issues.append(issue("total", "WARN", "POL-PARSE-101", "Could not parse total amount reliably."))
 
-    # 4) Compliance aggregation
+    # 4) Compliance aggregation — one pass; FAIL dominates, so stop there
     compliance = "PASS"
-    if any(i["severity"] == "FAIL" for i in issues):
-        compliance = "FAIL"
-    elif any(i["severity"] == "WARN" for i in issues):
-        compliance = "WARN"
+    for i in issues:
+        sev = i["severity"]
+        if sev == "FAIL":
+            compliance = "FAIL"
+            break
+        if sev == "WARN":
+            compliance = "WARN"
 
     # 5) Policy evidence (rule summaries)
     rule_summaries = attach_rule_summaries(issues)
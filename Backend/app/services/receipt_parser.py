@@ -1,7 +1,23 @@
+import os
 import re
-import uuid
+import threading
 from typing import List, Dict, Any, Optional, Tuple
 
+# Receipt ids only need 32 random bits for display purposes; refill a
+# pool of hex suffixes from one os.urandom read instead of paying a
+# uuid4 syscall + format per receipt.
+_ID_POOL_SIZE = 512
+_id_pool: List[str] = []
+_id_pool_lock = threading.Lock()
+
+
+def _next_receipt_suffix() -> str:
+    with _id_pool_lock:
+        if not _id_pool:
+            blob = os.urandom(_ID_POOL_SIZE * 4).hex()
+            _id_pool.extend(blob[i:i + 8] for i in range(0, len(blob), 8))
+        return _id_pool.pop()
+
 CURRENCY_REGEX = r"(EUR|€|USD|\$|GBP|£|INR|₹)"
 AMOUNT_REGEX = r"([0-9]+[.,][0-9]{2})"
 
@@ -46,15 +62,44 @@ CATEGORY_KEYWORDS = {
     "Software / Subscriptions": ["subscription", "license", "software", "cloud", "saas", "github"],
 }
 
+# Pre-compiled patterns. CPython's internal re cache is small and shared,
+# so compiling once at import time keeps the per-request hot path free of
+# cache lookups and parser setup.
+_AMOUNT_RE = re.compile(AMOUNT_REGEX)
+_CURRENCY_RE = re.compile(CURRENCY_REGEX)
+_DATE_RES = [re.compile(p) for p in DATE_REGEXES]
+_DATE_SPACED_RE = re.compile(r"\b(\d{4}\s*[./-]\s*\d{2}\s*[./-]\s*\d{2})\b")
+_DATE_INLINE_RE = re.compile(r"\b\d{4}[./-]\d{2}[./-]\d{2}\b")
+_WS_RE = re.compile(r"\s+")
+_NONNUMDOT_RE = re.compile(r"[^0-9.]")
+_ZIP_RE = re.compile(r"\b\d{5}\b")
+_LONG_NUMBER_RE = re.compile(r"\b\d{3,}\s*\d{3,}\b")
+_LEADING_QTY_RE = re.compile(r"^\d+\s+")
+_LOWER_RE = re.compile(r"[a-z]")
+_LETTER_RE = re.compile(r"[A-Za-z]")
+_DIGIT_RE = re.compile(r"\d")
+_CAP_WORD_RE = re.compile(r"[A-Z][a-z]+")
+_STORE_NUM_RE = re.compile(r"#\s*\d{2,6}")
+_STORE_NUM_CAPTURE_RE = re.compile(r"#\s*(\d{2,6})")
+_HASH_SPACING_RE = re.compile(r"\s*#\s*")
+_DASH_HASH_RE = re.compile(r"\s*-\s*#")
+_LEADING_NONALPHA_RE = re.compile(r"^[^A-Za-z]+")
+_NON_BRAND_CHARS_RE = re.compile(r"[^a-z0-9#]+")
+_DE1_RE = re.compile(r"\bDe1\b")
+_FRAGMENTED_HEADER_RE = re.compile(r"^[A-Za-z]+\s+[A-Z]{2,}\s+#\d+")
+_ADDRESS_TOKEN_RES = [re.compile(r"\b" + re.escape(t) + r"\b") for t in ADDRESS_TOKENS]
+_META_TOKEN_RES = [re.compile(r"\b" + re.escape(t) + r"\b") for t in META_TOKENS]
+_ITEM_HINT_RES = [re.compile(r"\b" + re.escape(t) + r"\b") for t in ITEM_LINE_HINTS]
+
 
 def _clean_line(s: str) -> str:
     s = (s or "").strip()
-    s = re.sub(r"\s+", " ", s)
+    s = _WS_RE.sub(" ", s)
     return s
 
 
 def _norm(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").lower()).strip()
+    return _WS_RE.sub(" ", (s or "").lower()).strip()
 
 
 def _ocr_cleanup_text(text: str) -> str:
@@ -88,13 +133,18 @@ def _is_noise_line(line: str) -> bool:
 def _avg_conf(words: List[Dict[str, Any]], tokens: List[str]) -> float:
     if not tokens:
         return 0.0
-    token_set = {t.lower() for t in tokens if t}
-    matched = []
+    # Index confidences by lowercased word text so token lookup is a dict
+    # hit instead of rescanning the word list per token.
+    conf_by_text: Dict[str, List[float]] = {}
     for w in words:
         t = (w.get("text") or "").lower()
         c = w.get("conf", -1.0)
-        if t in token_set and isinstance(c, (int, float)) and c >= 0:
-            matched.append(float(c))
+        if t and isinstance(c, (int, float)) and c >= 0:
+            conf_by_text.setdefault(t, []).append(float(c))
+    matched: List[float] = []
+    for t in tokens:
+        if t:
+            matched.extend(conf_by_text.get(t.lower(), ()))
     if not matched:
         return 0.5
     return sum(matched) / len(matched)
@@ -104,17 +154,17 @@ def _normalize_amount(s: str) -> str:
     if not s:
         return ""
     s = s.strip().replace(",", ".")
-    s = re.sub(r"[^0-9.]", "", s)
+    s = _NONNUMDOT_RE.sub("", s)
     return s
 
 
 def _find_date(text: str) -> Tuple[str, float]:
-    m = re.search(r"\b(\d{4}\s*[./-]\s*\d{2}\s*[./-]\s*\d{2})\b", text)
+    m = _DATE_SPACED_RE.search(text)
     if m:
-        return re.sub(r"\s+", "", m.group(1)), 0.85
+        return _WS_RE.sub("", m.group(1)), 0.85
 
-    for pat in DATE_REGEXES:
-        m = re.search(pat, text)
+    for pat in _DATE_RES:
+        m = pat.search(text)
         if m:
             return m.group(1), 0.75
 
@@ -122,57 +172,70 @@ def _find_date(text: str) -> Tuple[str, float]:
 
 
 def _find_currency(text: str) -> Tuple[str, float]:
-    m = re.search(CURRENCY_REGEX, text)
+    m = _CURRENCY_RE.search(text)
     if m:
         return m.group(1), 0.9
     return "EUR", 0.6
 
 
-def _extract_amount_on_lines(lines: List[str], keyword: str, avoid_keyword: Optional[str] = None) -> Optional[str]:
+def _index_amounts(lines: List[str], lines_low: List[str]) -> List[Tuple[str, List[str]]]:
+    """
+    One pass over the receipt: (lowercased line, dot-normalized amounts
+    on that line). The total/subtotal/tax lookups below query this index
+    instead of re-running the amount regex per keyword per line.
+    """
+    indexed: List[Tuple[str, List[str]]] = []
+    for line, low in zip(lines, lines_low):
+        amounts = [m.group(1).replace(",", ".") for m in _AMOUNT_RE.finditer(line)]
+        indexed.append((low, amounts))
+    return indexed
+
+
+def _extract_amount_on_lines(indexed: List[Tuple[str, List[str]]], keyword: str,
+                             avoid_keyword: Optional[str] = None) -> Optional[str]:
     key = keyword.lower()
     avoid = avoid_keyword.lower() if avoid_keyword else None
 
-    for i in range(len(lines) - 1, -1, -1):
-        low = lines[i].lower()
+    for i in range(len(indexed) - 1, -1, -1):
+        low, amounts = indexed[i]
 
         if key in low:
             if avoid and avoid in low:
                 continue
 
             # amount on same line
-            same_line = list(re.finditer(AMOUNT_REGEX, lines[i].replace(",", ".")))
-            if same_line:
-                return same_line[-1].group(1)
+            if amounts:
+                return amounts[-1]
 
             # amount on next line
-            if i + 1 < len(lines):
-                next_line = list(re.finditer(AMOUNT_REGEX, lines[i + 1].replace(",", ".")))
-                if next_line:
-                    return next_line[-1].group(1)
+            if i + 1 < len(indexed) and indexed[i + 1][1]:
+                return indexed[i + 1][1][-1]
 
     return None
 
 
-def _extract_all_amounts(lines: List[str], last_n_lines: int = 30) -> List[float]:
+def _extract_all_amounts(indexed: List[Tuple[str, List[str]]], last_n_lines: int = 30) -> List[float]:
     nums: List[float] = []
-    for line in lines[-last_n_lines:]:
-        for m in re.finditer(AMOUNT_REGEX, line.replace(",", ".")):
+    for _, amounts in indexed[-last_n_lines:]:
+        for a in amounts:
             try:
-                nums.append(float(m.group(1)))
+                nums.append(float(a))
             except Exception:
                 continue
     return nums
 
 
-def _find_total(lines: List[str]) -> Tuple[str, float]:
-    total = _extract_amount_on_lines(lines, "total", avoid_keyword="sub")
+def _find_total(lines: List[str], lines_low: List[str]) -> Tuple[str, float]:
+    indexed = _index_amounts(lines, lines_low)
+
+    total = _extract_amount_on_lines(indexed, "total", avoid_keyword="sub")
     if not total:
-        total = _extract_amount_on_lines(lines, "amount due")
+        total = _extract_amount_on_lines(indexed, "amount due")
     if not total:
-        total = _extract_amount_on_lines(lines, "balance due")
+        total = _extract_amount_on_lines(indexed, "balance due")
 
-    subtotal = _extract_amount_on_lines(lines, "sub total") or _extract_amount_on_lines(lines, "subtotal")
-    tax = _extract_amount_on_lines(lines, "tax")
+    subtotal = _extract_amount_on_lines(indexed, "sub total") or _extract_amount_on_lines(indexed, "subtotal")
+    tax = _extract_amount_on_lines(indexed, "tax")
 
     total_n = _normalize_amount(total) if total else ""
     subtotal_n = _normalize_amount(subtotal) if subtotal else ""
@@ -208,7 +271,7 @@ def _find_total(lines: List[str]) -> Tuple[str, float]:
         except Exception:
             return total_n, 0.6
 
-    amounts = _extract_all_amounts(lines, last_n_lines=30)
+    amounts = _extract_all_amounts(indexed, last_n_lines=30)
     if amounts:
         return f"{max(amounts):.2f}", 0.55
 
@@ -216,17 +279,17 @@ def _find_total(lines: List[str]) -> Tuple[str, float]:
 
 
 def _looks_like_address_or_meta(low: str) -> bool:
-    if re.search(r"\b\d{5}\b", low):
+    if _ZIP_RE.search(low):
         return True
-    if re.search(r"\b\d{3,}\s*\d{3,}\b", low):
+    if _LONG_NUMBER_RE.search(low):
         return True
-    for t in ADDRESS_TOKENS:
-        if re.search(r"\b" + re.escape(t) + r"\b", low):
+    for pat in _ADDRESS_TOKEN_RES:
+        if pat.search(low):
             return True
-    for t in META_TOKENS:
-        if re.search(r"\b" + re.escape(t) + r"\b", low):
+    for pat in _META_TOKEN_RES:
+        if pat.search(low):
             return True
-    if re.search(AMOUNT_REGEX, low.replace(",", ".")):
+    if _AMOUNT_RE.search(low.replace(",", ".")):
         return True
     return False
 
@@ -234,14 +297,14 @@ def _looks_like_address_or_meta(low: str) -> bool:
 def _looks_like_item_line(line: str) -> bool:
     low = _norm(line)
 
-    if re.match(r"^\d+\s+", low):
+    if _LEADING_QTY_RE.match(low):
         return True
 
-    if re.search(AMOUNT_REGEX, low.replace(",", ".")):
+    if _AMOUNT_RE.search(low.replace(",", ".")):
         return True
 
-    for token in ITEM_LINE_HINTS:
-        if re.search(r"\b" + re.escape(token) + r"\b", low):
+    for pat in _ITEM_HINT_RES:
+        if pat.search(low):
             return True
 
     return False
@@ -250,11 +313,11 @@ def _looks_like_item_line(line: str) -> bool:
 def _merchant_score(line: str, index: int = 0) -> float:
     low = _norm(line)
 
-    if not re.search(r"[a-z]", low):
+    if not _LOWER_RE.search(low):
         return -999.0
 
-    alpha = len(re.findall(r"[a-zA-Z]", line))
-    digits = len(re.findall(r"\d", line))
+    alpha = len(_LETTER_RE.findall(line))
+    digits = len(_DIGIT_RE.findall(line))
     length = len(line)
 
     score = 0.0
@@ -271,10 +334,10 @@ def _merchant_score(line: str, index: int = 0) -> float:
     if _looks_like_item_line(line):
         score -= 45.0
 
-    if re.search(r"#\s*\d{2,6}", line):
+    if _STORE_NUM_RE.search(line):
         score += 8.0
 
-    if re.search(r"[A-Z][a-z]+", line):
+    if _CAP_WORD_RE.search(line):
         score += 3.0
 
     if "," in line:
@@ -285,21 +348,21 @@ def _merchant_score(line: str, index: int = 0) -> float:
 
 def _clean_merchant_candidate(line: str) -> str:
     s = _clean_line(line)
-    s = re.sub(r"\s*#\s*", " #", s)
-    s = re.sub(r"\s*-\s*#", " #", s)
+    s = _HASH_SPACING_RE.sub(" #", s)
+    s = _DASH_HASH_RE.sub(" #", s)
 
-    m = re.search(r"\b\d{5}\b", s)
+    m = _ZIP_RE.search(s)
     if m and m.end() < len(s) - 2:
         tail = s[m.end():].strip(" ,-|")
-        if re.search(r"[A-Za-z]", tail):
+        if _LETTER_RE.search(tail):
             s = tail
 
     parts = [p.strip() for p in s.split(",") if p.strip()]
     if len(parts) >= 2:
-        if not _looks_like_address_or_meta(_norm(parts[0])) and re.search(r"[A-Za-z]", parts[0]):
+        if not _looks_like_address_or_meta(_norm(parts[0])) and _LETTER_RE.search(parts[0]):
             s = parts[0]
 
-    s = re.sub(r"^[^A-Za-z]+", "", s).strip()
+    s = _LEADING_NONALPHA_RE.sub("", s).strip()
     return s
 
 
@@ -316,7 +379,7 @@ def _build_header_block(lines: List[str]) -> str:
             continue
         if _looks_like_item_line(line):
             continue
-        if re.search(r"\b\d{4}[./-]\d{2}[./-]\d{2}\b", low):
+        if _DATE_INLINE_RE.search(low):
             continue
         if any(p in low for p in NOISE_PREFIXES):
             continue
@@ -344,9 +407,9 @@ def _brand_like_rescue(text: str, header_block: str) -> Optional[Tuple[str, floa
     Returns (merchant, confidence).
     """
     combined = f"{text} {header_block}"
-    compact = re.sub(r"[^a-z0-9#]+", "", combined.lower())
+    compact = _NON_BRAND_CHARS_RE.sub("", combined.lower())
 
-    store_match = re.search(r"#\s*(\d{2,6})", combined)
+    store_match = _STORE_NUM_CAPTURE_RE.search(combined)
     store_num = store_match.group(1) if store_match else None
 
     # Strong rescue for Del Friscos
@@ -393,8 +456,8 @@ def _find_merchant(lines: List[str], words: List[Dict[str, Any]], full_text: str
     candidates.sort(key=lambda x: x[1], reverse=True)
     merchant = candidates[0][0]
 
-    merchant = re.sub(r"\s+", " ", merchant).strip(" -|,")
-    merchant = re.sub(r"\bDe1\b", "Del", merchant)
+    merchant = _WS_RE.sub(" ", merchant).strip(" -|,")
+    merchant = _DE1_RE.sub("Del", merchant)
     merchant = _title_case_brand(merchant)
 
     conf = _avg_conf(words, merchant.split()[:4])
@@ -406,14 +469,14 @@ def _find_merchant(lines: List[str], words: List[Dict[str, Any]], full_text: str
         conf = min(conf, 0.65)
     if "friscos" in low_merchant and "del" not in low_merchant:
         conf = min(conf, 0.72)
-    if re.match(r"^[A-Za-z]+\s+[A-Z]{2,}\s+#\d+", merchant):
+    if _FRAGMENTED_HEADER_RE.match(merchant):
         conf = min(conf, 0.70)
 
     conf = max(0.4, min(conf, 0.9))
     return merchant, round(conf, 2)
 
 
-def _suggest_category(text: str, merchant: str, lines: Optional[List[str]] = None) -> Tuple[str, float]:
+def _suggest_category(text: str, merchant: str, lines_low: Optional[List[str]] = None) -> Tuple[str, float]:
     blob = _norm(merchant) + "\n" + _norm(text)
 
     best_cat = "Other"
@@ -431,11 +494,10 @@ def _suggest_category(text: str, merchant: str, lines: Optional[List[str]] = Non
                 best_conf = conf
                 best_cat = cat
 
-    if best_cat == "Other" and lines:
+    if best_cat == "Other" and lines_low:
         meal_hits = 0
         meal_terms = ["oyster", "ribeye", "filet", "asparagus", "gratin", "steak", "bar", "cafe"]
-        for line in lines:
-            low = _norm(line)
+        for low in lines_low:
             if any(term in low for term in meal_terms):
                 meal_hits += 1
 
@@ -446,17 +508,19 @@ def _suggest_category(text: str, merchant: str, lines: Optional[List[str]] = Non
 
 
 def parse_receipt_fields(text: str, words: List[Dict[str, Any]]) -> Dict[str, Any]:
-    receipt_id = "r_" + uuid.uuid4().hex[:8]
+    receipt_id = "r_" + _next_receipt_suffix()
 
     cleaned_text = _ocr_cleanup_text(text or "")
     raw_lines = [l for l in cleaned_text.splitlines() if l.strip()]
     lines = [_clean_line(l) for l in raw_lines]
+    # Lowercase once; the total and category helpers only need to read it.
+    lines_low = [l.lower() for l in lines]
 
     merchant, merchant_conf = _find_merchant(lines, words, cleaned_text)
     date_val, date_conf = _find_date(cleaned_text)
-    total_val, total_conf = _find_total(lines)
+    total_val, total_conf = _find_total(lines, lines_low)
     cur_val, cur_conf = _find_currency(cleaned_text)
-    cat_val, cat_conf = _suggest_category(cleaned_text, merchant, lines)
+    cat_val, cat_conf = _suggest_category(cleaned_text, merchant, lines_low)
 
     return {
         "receipt_id": receipt_id,